@@ -1,15 +1,20 @@
 import asyncio
+import hashlib
 import logging
+import time
 from datetime import datetime, timezone
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+from fastapi.responses import Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi import Request
 import json
+import msgpack
+from collections import deque
 from pathlib import Path
 import os
-import httpx 
+import socket
+import httpx
 
 from models import SensorData, Setpoints, Controls, GreenhouseState, SetpointRequest
 
@@ -28,10 +33,24 @@ logger = logging.getLogger(__name__)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 NODE_RED_URL = os.getenv("NODE_RED_URL", "http://nodered:1880")
 
+# TCP_NODELAY nas conexões com o Node-RED: os POSTs são minúsculos e o
+# algoritmo de Nagle seguraria o pacote esperando ACK (~40ms por escrita)
+_NODE_RED_SOCKET_OPTIONS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+
+
+def _node_red_transport() -> httpx.AsyncHTTPTransport:
+    return httpx.AsyncHTTPTransport(socket_options=_NODE_RED_SOCKET_OPTIONS)
+
+
+def _now_ms() -> int:
+    """Epoch em milissegundos (int): mais barato que isoformat() e o
+    frontend formata com new Date(ts)."""
+    return time.time_ns() // 1_000_000
+
 
 
 current_state = GreenhouseState(
-    timestamp=datetime.now().isoformat(),
+    timestamp=_now_ms(),
     connected=False,
     sensors=SensorData(),
     setpoints=Setpoints(),
@@ -39,8 +58,124 @@ current_state = GreenhouseState(
     meta={}
 )
 
-# Lista de WebSockets conectados (para broadcast)
-active_connections: list[WebSocket] = []
+def _swap_state(**updates) -> None:
+    """Copy-on-write: constrói um estado novo e rebinda a referência
+    global de uma só vez. Rebind de global é atômico no CPython, então
+    leitor (WebSocket, /api/state) nunca enxerga atualização parcial.
+    """
+    global current_state, _state_json
+    current_state = current_state.model_copy(
+        update={"timestamp": _now_ms(), "connected": True, **updates}
+    )
+    _state_json = None  # invalida o cache de /api/state
+
+
+def _make_setpoint_setter(name: str):
+    def _set(setpoints: Setpoints, value: float) -> None:
+        setattr(setpoints, name, value)
+    return _set
+
+
+# Dispatch especializado no import: um closure por setpoint em vez de
+# correr o if/elif de nomes a cada requisição
+_SETPOINT_SETTERS = {
+    name: _make_setpoint_setter(name) for name in Setpoints.model_fields
+}
+
+# Debounce das escritas de setpoint: mudanças em sequência rápida são
+# coalescidas (dedupe por nome) e enviadas juntas numa conexão só ao
+# Node-RED, em vez de um round-trip completo por tecla do usuário
+SETPOINT_FLUSH_DELAY = 0.05
+_pending_setpoints: dict[str, float] = {}
+_setpoint_flush_task: asyncio.Task | None = None
+
+
+async def _flush_setpoints() -> None:
+    global _setpoint_flush_task
+    await asyncio.sleep(SETPOINT_FLUSH_DELAY)
+    pending = dict(_pending_setpoints)
+    _pending_setpoints.clear()
+    _setpoint_flush_task = None
+    if not pending:
+        return
+
+    # Erro em um setpoint não derruba o resto da rajada
+    for name, value in pending.items():
+        try:
+            resp = await node_red_client.post(
+                "/api/setpoint",
+                json={"topic": name, "value": value},
+            )
+            if resp.status_code >= 400:
+                logger.error(f"Node-RED retornou {resp.status_code}: {resp.text}")
+        except Exception as e:
+            logger.error(f"Erro ao enviar setpoint '{name}' para Node-RED: {e}")
+
+
+def _queue_setpoint_write(name: str, value: float) -> None:
+    global _setpoint_flush_task
+    _pending_setpoints[name] = value
+    if _setpoint_flush_task is None:
+        _setpoint_flush_task = asyncio.create_task(_flush_setpoints())
+
+
+# Janela rolante dos sensores mantida no servidor: cliente novo recebe
+# o histórico pronto no primeiro frame em vez de abrir com gráfico vazio
+HISTORY_WINDOW = 30
+HISTORIES: dict[str, deque] = {
+    name: deque(maxlen=HISTORY_WINDOW) for name in SensorData.model_fields
+}
+
+# Cache da resposta JSON de /api/state, invalidado a cada _swap_state:
+# GETs repetidos entre escritas reusam os mesmos bytes
+_state_json: bytes | None = None
+
+# Barramento pub/sub interno: o estado é serializado UMA vez por mudança
+# e entregue a cada assinante via fila limitada, em vez de cada conexão
+# ter seu próprio loop de envio periódico.
+latest_payload: bytes | None = None
+
+# Digest do último estado publicado (sem o timestamp) pra suprimir
+# frames idênticos: variáveis de estufa mudam devagar, a maioria dos
+# POSTs chega com os mesmos valores
+_last_state_digest: str | None = None
+
+# Intervalo do heartbeat (s) quando nada muda, só pra manter a conexão viva
+WS_HEARTBEAT_TIMEOUT = 5.0
+
+# Frame mínimo de keepalive: mapa msgpack vazio, 1 byte (o frontend
+# ignora mensagens sem "sensors")
+_WS_PING = msgpack.packb({})
+
+# Tamanho máximo da fila de saída por assinante
+WS_QUEUE_MAX = 8
+
+
+class SubscriberQueue:
+    """Fila de saída por assinante, limitada, com descarte do mais antigo.
+
+    Cliente lento perde frames intermediários em vez de travar o
+    broadcast ou acumular memória sem limite.
+    """
+
+    def __init__(self, maxsize: int = WS_QUEUE_MAX):
+        self._queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=maxsize)
+
+    def enqueue(self, msg: bytes) -> None:
+        # Nunca bloqueia o publicador: se a fila encheu, descarta o mais antigo
+        if self._queue.full():
+            try:
+                self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        self._queue.put_nowait(msg)
+
+    async def get(self) -> bytes:
+        return await self._queue.get()
+
+
+# Assinantes ativos (uma fila por WebSocket conectado)
+subscribers: list[SubscriberQueue] = []
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # FASTAPI
@@ -51,27 +186,43 @@ app = FastAPI(title="Greenhouse Observer API", version="3.0")
 # Templates (se quiser HTML separado)
 templates = Jinja2Templates(directory="templates")
 
+# Cliente HTTP compartilhado com o Node-RED: pool de conexões keep-alive
+# (com TCP_NODELAY) reutilizado entre requisições, em vez de abrir e
+# fechar um socket novo a cada POST
+node_red_client: httpx.AsyncClient | None = None
+
+
+@app.on_event("startup")
+async def _open_node_red_client():
+    global node_red_client
+    node_red_client = httpx.AsyncClient(
+        base_url=NODE_RED_URL, timeout=5.0, transport=_node_red_transport()
+    )
+
+
+@app.on_event("shutdown")
+async def _close_node_red_client():
+    if node_red_client is not None:
+        await node_red_client.aclose()
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # ENDPOINTS: Node-RED → FastAPI
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 @app.post("/api/estufa/enable")
 async def set_greenhouse_enable(payload: Controls):
-    global current_state
-
     enabled = bool(payload.greenhouse_liga)
 
     # Atualiza estado local (UI responde na hora)
-    current_state.controls.greenhouse_liga = enabled
-    current_state.timestamp = datetime.now(timezone.utc).isoformat()
-    current_state.connected = True
+    _swap_state(
+        controls=current_state.controls.model_copy(update={"greenhouse_liga": enabled})
+    )
 
     # Envia pro Node-RED escrever no OpenPLC via Modbus
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.post(
-                f"{NODE_RED_URL}/api/estufa/enable",
-                json={"Liga.value": enabled}
-            )
+        resp = await node_red_client.post(
+            "/api/estufa/enable",
+            json={"Liga.value": enabled}
+        )
         if resp.status_code >= 400:
             logger.error(f"Node-RED retornou {resp.status_code}: {resp.text}")
             return {"status": "error", "node_red_status": resp.status_code, "detail": resp.text}
@@ -89,19 +240,14 @@ async def update_setpoints(data: dict):
     Node-RED manda aqui os setpoints atuais vindos do MQTT (estufas/setpoints)
     Ex: { "Setpoint_Umidade_solo": 60, "Setpoint_Umidade_Ar": 70, "Setpoint_temp": 25 }
     """
-    global current_state
-
     # Atualiza só os campos presentes
     sp = data or {}
-    if "Setpoint_Umidade_solo" in sp:
-        current_state.setpoints.Setpoint_Umidade_solo = sp["Setpoint_Umidade_solo"]
-    if "Setpoint_Umidade_Ar" in sp:
-        current_state.setpoints.Setpoint_Umidade_Ar = sp["Setpoint_Umidade_Ar"]
-    if "Setpoint_temp" in sp:
-        current_state.setpoints.Setpoint_temp = sp["Setpoint_temp"]
+    setpoints = current_state.setpoints.model_copy()
+    for name, setter in _SETPOINT_SETTERS.items():
+        if name in sp:
+            setter(setpoints, sp[name])
 
-    current_state.timestamp = datetime.now().isoformat()
-    current_state.connected = True  # ou deixe isso só pros sensores, se preferir
+    _swap_state(setpoints=setpoints)  # connected=True; ou deixe isso só pros sensores, se preferir
 
     await broadcast_state()
     return {"status": "ok"}
@@ -115,41 +261,23 @@ async def set_setpoint(req: SetpointRequest):
     POST /api/setpoint
     {"name": "Setpoint_Umidade_solo", "value": 65}
     """
-    global current_state
     name = req.name
     value = req.value
     logger.info(f"✓ /api/setpoint name={name} value={value}")
 
     # Atualiza estado local (igual você já fazia)
-    if name == "Setpoint_Umidade_solo":
-        current_state.setpoints.Setpoint_Umidade_solo = value
-    elif name == "Setpoint_Umidade_Ar":
-        current_state.setpoints.Setpoint_Umidade_Ar = value
-    elif name == "Setpoint_temp":
-        current_state.setpoints.Setpoint_temp = value
-    else:
-        return {"error": f"Setpoint desconhecido: {name}"}   
+    setter = _SETPOINT_SETTERS.get(name)
+    if setter is None:
+        return {"error": f"Setpoint desconhecido: {name}"}
+    setpoints = current_state.setpoints.model_copy()
+    setter(setpoints, value)
+    _swap_state(setpoints=setpoints)
     logger.info(f"✓ Setpoint '{name}' = {value}")
 
-    # Envia ao Node-RED apenas o setpoint alterado (topic e value separados).
-    setpoint_update = {
-      "topic": name,
-      "value": value
-    }
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.post(f"{NODE_RED_URL}/api/setpoint", json=setpoint_update)
-
-        if resp.status_code >= 400:
-            logger.error(f"Node-RED retornou {resp.status_code}: {resp.text}")
-            return {"status": "error", "node_red_status": resp.status_code, "detail": resp.text}
-
-    except Exception as e:
-        logger.error(f"Erro ao enviar setpoint para Node-RED: {e}")
-        return {"status": "error", "detail": str(e)}
+    # Envia ao Node-RED apenas o setpoint alterado (topic e value separados),
+    # via buffer com debounce: rajadas de mudanças saem coalescidas
+    _queue_setpoint_write(name, value)
 
-    current_state.timestamp = datetime.now(timezone.utc).isoformat()
-    current_state.connected = True
     await broadcast_state()
 
     return {"status": "ok", "name": name, "value": value}
@@ -167,14 +295,16 @@ async def update_state(data: dict):
   },
   
     """
-    global current_state
-
     sensors = data.get("sensors", {})
 
-    current_state.sensors = SensorData(**sensors) if sensors else current_state.sensors
-    
-    current_state.timestamp = datetime.now().isoformat()
-    current_state.connected = True
+    if sensors:
+        new_sensors = SensorData(**sensors)
+        _swap_state(sensors=new_sensors)
+        ts = current_state.timestamp
+        for name, window in HISTORIES.items():
+            window.append((ts, getattr(new_sensors, name)))
+    else:
+        _swap_state()
 
     # Broadcast para todos WebSockets conectados
     await broadcast_state()
@@ -197,8 +327,7 @@ async def update_controls(data: Controls):
     """
     edge_dt = None
     now_utc = datetime.now(timezone.utc)
-    global current_state
-    
+
     if data.time_stamp:
         try:
             edge_dt = datetime.fromisoformat(data.time_stamp.replace("Z", "+00:00"))
@@ -212,9 +341,7 @@ async def update_controls(data: Controls):
             logger.exception(f"Falha calculando latência: {e}")
             data.latency_ms = None
     # Controls sao somente leitura no frontend e chegam apenas do Node-RED.
-    current_state.controls = data
-    current_state.timestamp = datetime.now(timezone.utc).isoformat()
-    current_state.connected = True
+    _swap_state(controls=data)
 
     logger.info(
       f"✓ Controles atualizados: Cooling={data.cooler_status}, Heating={data.Aquecimento_status}, Irrigacao={data.irrigacao_status}, Lamp={data.lamp_status}, latency_ms={data.latency_ms} "
@@ -231,8 +358,11 @@ async def update_controls(data: Controls):
 
 @app.get("/api/state")
 async def get_state():
-    """Retorna estado completo atual"""
-    return current_state.dict()
+    """Retorna estado completo atual (bytes cacheados até a próxima escrita)"""
+    global _state_json
+    if _state_json is None:
+        _state_json = json.dumps(current_state.dict()).encode("utf-8")
+    return Response(content=_state_json, media_type="application/json")
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -243,55 +373,62 @@ async def get_state():
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket para enviar atualizações em tempo real ao frontend"""
     await websocket.accept()
-    active_connections.append(websocket)
-    logger.info(f"✓ WebSocket conectado (total: {len(active_connections)})")
-    
+    sub = SubscriberQueue()
+    subscribers.append(sub)
+    logger.info(f"✓ WebSocket conectado (total: {len(subscribers)})")
+
     try:
-        # Envia estado inicial
-        await websocket.send_json(current_state.dict())
-        
-        # Mantém conexão viva
+        # Envia estado inicial com o histórico pronto pra semear os gráficos
+        snapshot = current_state.dict()
+        snapshot["history"] = {k: list(v) for k, v in HISTORIES.items()}
+        await websocket.send_bytes(msgpack.packb(snapshot, use_bin_type=True))
+
+        # Drena a fila do assinante; no timeout manda só um ping de
+        # 1 byte pra manter a conexão viva (nginx derruba socket ocioso)
         while True:
-            await asyncio.sleep(1)
-            # Estado é enviado via broadcast quando algo muda
-    
+            try:
+                msg = await asyncio.wait_for(sub.get(), timeout=WS_HEARTBEAT_TIMEOUT)
+            except asyncio.TimeoutError:
+                msg = _WS_PING
+            await websocket.send_bytes(msg)
+
     except WebSocketDisconnect:
-        active_connections.remove(websocket)
-        logger.info(f"✗ WebSocket desconectado (restantes: {len(active_connections)})")
+        subscribers.remove(sub)
+        logger.info(f"✗ WebSocket desconectado (restantes: {len(subscribers)})")
     except Exception as e:
         logger.error(f"Erro no WebSocket: {e}")
-        active_connections.remove(websocket)
+        subscribers.remove(sub)
 
 
 async def broadcast_state():
-    if not active_connections:
-        return
+    global latest_payload, _last_state_digest
 
     data = current_state.dict()
-    dead = []
 
-    for ws in active_connections:
-        try:
-            await ws.send_json(data)
-        except Exception as e:
-            logger.warning(f"WebSocket fechado/removendo: {e}")
-            dead.append(ws)
+    # O timestamp muda a cada POST mesmo quando os valores não mudam;
+    # compara o digest do conteúdo útil e só publica se algo mudou de fato
+    digest = hashlib.md5(
+        msgpack.packb({k: v for k, v in data.items() if k != "timestamp"}, use_bin_type=True)
+    ).hexdigest()
+    if digest == _last_state_digest and latest_payload is not None:
+        return
+    _last_state_digest = digest
+
+    # Serializa UMA vez por mudança; todos os sockets reaproveitam os bytes
+    latest_payload = msgpack.packb(data, use_bin_type=True)
 
-    for ws in dead:
-        if ws in active_connections:
-            active_connections.remove(ws)
+    # Publica sem await: assinante lento descarta frames, não trava ninguém
+    for sub in subscribers:
+        sub.enqueue(latest_payload)
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # FRONTEND HTML
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-@app.get("/")
-async def get_dashboard():
-    """Serve o dashboard HTML"""
-    # Mantém o mesmo HTML que você já tem
-    # Só muda a estrutura de dados que o WebSocket envia
-    html_content = """
+# Mantém o mesmo HTML que você já tem
+# Só muda a estrutura de dados que o WebSocket envia
+DASHBOARD_HTML = """
 <!DOCTYPE html>
 <html lang="pt-BR">
 <head>
@@ -630,6 +767,7 @@ body {
 
 
 <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+<script src="https://cdn.jsdelivr.net/npm/@msgpack/msgpack@3/dist.umd/msgpack.min.js"></script>
 <script>
 // ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 // GRÁFICOS
@@ -795,6 +933,34 @@ function updateClimateChart(soilHum, airHum, atualTemp) {
 }
 
 
+// Semeia os gráficos com o histórico que o servidor manda no 1º frame
+// (lista de pares [timestamp_ms, valor] por sensor)
+function seedCharts(history) {
+  const series = {
+    Umidade_solo: 'chartSolo',
+    Umidade_Ar: 'chartAr',
+    Temperatura_Atual: 'chartTempAtual'
+  };
+  for (const [key, chartId] of Object.entries(series)) {
+    const chart = chartInstances[chartId];
+    const points = history[key] || [];
+    if (!chart) continue;
+    chart.data.labels = points.map(p => new Date(p[0]).toLocaleTimeString());
+    chart.data.datasets[0].data = points.map(p => p[1]);
+    chart.update('none');
+  }
+
+  if (climateChart) {
+    const base = history.Umidade_solo || [];
+    climateChart.data.labels = base.map(p => new Date(p[0]).toLocaleTimeString());
+    climateChart.data.datasets[0].data = (history.Umidade_solo || []).map(p => p[1]);
+    climateChart.data.datasets[1].data = (history.Umidade_Ar || []).map(p => p[1]);
+    climateChart.data.datasets[2].data = (history.Temperatura_Atual || []).map(p => p[1]);
+    climateChart.update('none');
+  }
+}
+
+
 // Inicializa gráficos
 createChart('chartSolo', 'Umidade do Solo');
 createChart('chartAr', 'Umidade do Ar');
@@ -809,19 +975,41 @@ createClimateChart();
 let lastControls = null;
 
 
-const ws = new WebSocket("ws://" + window.location.host + "/ws/live");
+// Reconexão com backoff exponencial, sem recarregar a página inteira
+// (o reload perdia o histórico dos gráficos e rebaixava tudo do zero).
+// O guard reconnectTimer evita duas tentativas simultâneas quando
+// onerror e onclose disparam juntos.
+let ws = null;
+let reconnectTimer = null;
+let reconnectDelay = 1000;
+const RECONNECT_DELAY_MAX = 15000;
 
 
-ws.onopen = () => {
+function scheduleReconnect() {
+  if (reconnectTimer) return;
+  reconnectTimer = setTimeout(() => {
+    reconnectTimer = null;
+    connectWebSocket();
+  }, reconnectDelay);
+  reconnectDelay = Math.min(reconnectDelay * 2, RECONNECT_DELAY_MAX);
+}
+
+
+function onWsOpen() {
   console.log("✓ WebSocket conectado");
+  reconnectDelay = 1000;
   document.getElementById("statusBar").className = "status-bar connected";
   document.getElementById("statusBar").textContent = "● Conectado";
-};
+}
 
 
-ws.onmessage = (event) => {
-  const data = JSON.parse(event.data);
- 
+function onWsMessage(event) {
+  // O servidor envia frames binários msgpack (bem menor que JSON)
+  const data = MessagePack.decode(new Uint8Array(event.data));
+
+  // Heartbeat do servidor: frame vazio, só keepalive
+  if (!data || !data.sensors) return;
+
   // Status
   const statusBar = document.getElementById("statusBar");
   if (data.connected) {
@@ -872,16 +1060,19 @@ ws.onmessage = (event) => {
 
 
   document.getElementById("soloValue").textContent = soilHum.toFixed(1) + "%";
-  updateChart('chartSolo', soilHum);
- 
   document.getElementById("arValue").textContent = airHum.toFixed(1) + "%";
-  updateChart('chartAr', airHum);
- 
   document.getElementById("tempSoloValue").textContent = atualTemp.toFixed(1) + "°C";
-  updateChart('chartTempAtual', atualTemp);
 
 
-  updateClimateChart(soilHum, airHum, atualTemp);
+  if (data.history) {
+    // Frame inicial: semeia os gráficos com a janela mantida no servidor
+    seedCharts(data.history);
+  } else {
+    updateChart('chartSolo', soilHum);
+    updateChart('chartAr', airHum);
+    updateChart('chartTempAtual', atualTemp);
+    updateClimateChart(soilHum, airHum, atualTemp);
+  }
  
   // ━━ Setpoints
   const setpoints = data.setpoints || {};
@@ -903,20 +1094,37 @@ ws.onmessage = (event) => {
 
 
   updateLastEvents(controls, data);
-};
+}
 
 
-ws.onerror = (error) => {
+function onWsError(error) {
   console.error("✗ Erro WebSocket:", error);
-};
+}
 
 
-ws.onclose = () => {
+function onWsClose() {
   console.log("✗ WebSocket desconectado");
   document.getElementById("statusBar").className = "status-bar disconnected";
   document.getElementById("statusBar").textContent = "● Reconectando...";
-  setTimeout(() => location.reload(), 5000);
-};
+  scheduleReconnect();
+}
+
+
+function connectWebSocket() {
+  // Guard: não abre uma segunda conexão se já existe uma viva/abrindo
+  if (ws && (ws.readyState === WebSocket.CONNECTING || ws.readyState === WebSocket.OPEN)) {
+    return;
+  }
+  ws = new WebSocket("ws://" + window.location.host + "/ws/live");
+  ws.binaryType = "arraybuffer";
+  ws.onopen = onWsOpen;
+  ws.onmessage = onWsMessage;
+  ws.onerror = onWsError;
+  ws.onclose = onWsClose;
+}
+
+
+connectWebSocket();
 
 
 // ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -1012,9 +1220,28 @@ document.getElementById("tempSoloSp").addEventListener("change", (e) => {
 </body>
 </html>
 """
-    return HTMLResponse(html_content)
+
+# Pré-codificado no import: evita realocar/re-encodar ~6KB a cada GET
+_HTML_BYTES = DASHBOARD_HTML.encode("utf-8")
+_HTML_ETAG = f'"{hashlib.md5(_HTML_BYTES).hexdigest()}"'
+_HTML_HEADERS = {
+    "Cache-Control": "public, max-age=3600",
+    "ETag": _HTML_ETAG,
+}
+
+
+@app.get("/")
+async def get_dashboard(request: Request):
+    """Serve o dashboard HTML (bytes pré-codificados, com cache no browser)"""
+    if request.headers.get("if-none-match") == _HTML_ETAG:
+        return Response(status_code=304, headers=_HTML_HEADERS)
+    return Response(
+        content=_HTML_BYTES,
+        media_type="text/html; charset=utf-8",
+        headers=_HTML_HEADERS,
+    )
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop")
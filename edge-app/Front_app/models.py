@@ -25,7 +25,7 @@ class Controls(BaseModel):
     latency_ms: Optional[int] = None
 
 class GreenhouseState(BaseModel):
-    timestamp: str
+    timestamp: int  # epoch em milissegundos (o frontend formata com new Date)
     connected: bool = False
     sensors: SensorData = Field(default_factory=SensorData)
     setpoints: Setpoints = Field(default_factory=Setpoints)